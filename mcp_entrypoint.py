@@ -12,56 +12,121 @@ Usage: Claude spawns this script (via your wrapper). It speaks JSON-RPC over STD
 """
 
 import sys
+import io
 import json
-import subprocess
-import threading
+import asyncio
+import stat
 import time
 import os
 import re
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
 BASE = Path(__file__).parent
 TAIL_SCRIPT = BASE / "mcp_ws_tail_server.py"
 WS_PORT = 8765  # default port, but may be overridden if port is in use
 PORT_FILE = BASE / ".ws_port"  # File where tail server writes the actual port
+TAIL_BLOCK_SIZE = 64 * 1024  # Block size used when reading a file backwards
+
+# JSON encode/decode for the stdio transport; encoding produces UTF-8 bytes
+if orjson is not None:
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+else:
+    def json_dumps(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    json_loads = json.loads
+
+STDIN_LINE_LIMIT = 16 * 1024 * 1024  # Longest JSON-RPC line accepted on stdin
+
+# Asyncio stream writer for stdout, set up by stdin_loop() when stdout is a pipe;
+# otherwise replies are written to sys.stdout.buffer directly
+stdout_writer = None
+
+def write_out(data):
+    if stdout_writer is not None:
+        stdout_writer.write(data)
+    else:
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
 
 # Helper: write JSON-RPC object to stdout (Claude reads this)
 def send(obj):
     try:
-        s = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
-        sys.stdout.write(s + "\n")
-        sys.stdout.flush()
+        write_out(json_dumps(obj) + b"\n")
     except Exception as e:
         print(f"[mcp-entry] send error: {e}", file=sys.stderr, flush=True)
 
+# Helper: write a JSON-RPC reply whose result is already serialized, so only
+# the request id is encoded per call
+def send_result(msg_id, result_bytes):
+    try:
+        write_out(b'{"jsonrpc":"2.0","id":' + json_dumps(msg_id) + b',"result":' + result_bytes + b'}\n')
+    except Exception as e:
+        print(f"[mcp-entry] send error: {e}", file=sys.stderr, flush=True)
+
+def is_private_pipe(fd):
+    """True if fd is a pipe or socket that is not also our stderr.
+
+    Asyncio pipe transports switch their fd to non-blocking mode, which would
+    also affect stderr if both share one open file (a terminal, or 2>&1)."""
+    try:
+        st = os.fstat(fd)
+        err = os.fstat(sys.stderr.fileno())
+    except (OSError, ValueError):
+        return False
+    if not (stat.S_ISFIFO(st.st_mode) or stat.S_ISSOCK(st.st_mode)):
+        return False
+    return (st.st_dev, st.st_ino) != (err.st_dev, err.st_ino)
+
 # Launch the tail server as a subprocess (so it runs in the venv / env you expect)
-def start_tail_subprocess():
+async def start_tail_subprocess():
     # Use the same python interpreter that launched this entrypoint
     python = sys.executable
     cmd = [python, str(TAIL_SCRIPT)]
     # pass through environment (DOTENV is loaded by tail script itself)
     print(f"[mcp-entry] starting tail subprocess: {cmd}", file=sys.stderr, flush=True)
-    p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    # Reader threads to forward child stdout/stderr to our stderr for debugging
-    def forward_stream(src, name):
-        for line in src:
-            sys.stderr.write(f"[tail-{name}] {line}")
-            sys.stderr.flush()
-    threading.Thread(target=forward_stream, args=(p.stdout, "out"), daemon=True).start()
-    threading.Thread(target=forward_stream, args=(p.stderr, "err"), daemon=True).start()
-    return p
-
-# Start tail server subprocess early
-tail_proc = None
-try:
-    if not TAIL_SCRIPT.exists():
-        print(f"[mcp-entry] ERROR: tail script not found at {TAIL_SCRIPT}", file=sys.stderr, flush=True)
-    else:
-        tail_proc = start_tail_subprocess()
-except Exception as e:
-    print(f"[mcp-entry] failed to start tail subprocess: {e}", file=sys.stderr, flush=True)
-    tail_proc = None
+    return await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+
+async def forward_stream(stream, prefix):
+    """Forward a child output stream to our stderr for debugging, line by line."""
+    partial = b""  # incomplete last line
+    while True:
+        data = await stream.read(65536)
+        if not data:
+            # EOF: flush an unterminated last line
+            if partial:
+                sys.stderr.buffer.write(prefix + partial + b"\n")
+                sys.stderr.buffer.flush()
+            return
+        lines = (partial + data).split(b"\n")
+        partial = lines.pop()
+        if lines:
+            # Write every complete line from this read in one go
+            sys.stderr.buffer.write(b"".join(prefix + line + b"\n" for line in lines))
+            sys.stderr.buffer.flush()
+
+# Set once the tail server has written PORT_FILE (or can no longer do so).
+# Created by main() on the running loop: before Python 3.10 an Event binds
+# to the loop current at construction, which at import is not asyncio.run's
+port_ready = None
+
+async def watch_port_file(proc, started_ns):
+    """Wait in the background for the tail server to write PORT_FILE."""
+    deadline = time.monotonic() + 10
+    while proc.returncode is None and time.monotonic() < deadline:
+        try:
+            if PORT_FILE.stat().st_mtime_ns >= started_ns:
+                break
+        except FileNotFoundError:
+            pass
+        await asyncio.sleep(0.05)
+    port_ready.set()
 
 # Advertised tool metadata
 TOOL_NAME = "gdb-tail"
@@ -152,47 +217,50 @@ def get_tools_list():
         }
     ]
 
+# The initialize and tools/list results never change, so serialize them once
+INITIALIZE_RESULT_BYTES = json_dumps({
+    "protocolVersion": "2024-11-05",
+    "capabilities": {
+        "tools": {}
+    },
+    "serverInfo": {
+        "name": "gdb-streamer",
+        "version": "0.1.0"
+    }
+})
+TOOLS_LIST_RESULT_BYTES = json_dumps({"tools": get_tools_list()})
+
 # When Claude sends initialize (id present) we reply with capabilities including tools
 def handle_initialize(msg):
-    result = {
-        "protocolVersion": "2024-11-05",
-        "capabilities": {
-            "tools": {}
-        },
-        "serverInfo": {
-            "name": "gdb-streamer",
-            "version": "0.1.0"
-        }
-    }
-    resp = {"jsonrpc": "2.0", "id": msg.get("id"), "result": result}
-    send(resp)
+    send_result(msg.get("id"), INITIALIZE_RESULT_BYTES)
 
 # Handle tools/list request
 def handle_tools_list(msg):
-    tools = get_tools_list()
-    resp = {
-        "jsonrpc": "2.0",
-        "id": msg.get("id"),
-        "result": {
-            "tools": tools
-        }
-    }
-    send(resp)
+    send_result(msg.get("id"), TOOLS_LIST_RESULT_BYTES)
 
-def get_actual_port():
+# Port last read from PORT_FILE and the file mtime it was read at
+cached_port = None
+cached_port_mtime = None
+
+async def get_actual_port():
     """Get the actual port the tail server is using."""
-    # Try to read from port file first (tail server writes this)
-    # Retry a few times in case the file hasn't been written yet
-    for attempt in range(10):
-        if PORT_FILE.exists():
-            try:
-                port = int(PORT_FILE.read_text().strip())
-                return port
-            except Exception as e:
-                if attempt == 9:  # Last attempt
-                    print(f"[mcp-entry] Could not read port from {PORT_FILE}: {e}", file=sys.stderr, flush=True)
-        if attempt < 9:
-            time.sleep(0.1)  # Wait 100ms before retrying
+    global cached_port, cached_port_mtime
+    # The tail server writes its port to PORT_FILE at startup. Only a call
+    # made while it is still starting waits (for watch_port_file); after
+    # that the cached port is reused for as long as the file is unchanged
+    try:
+        await asyncio.wait_for(port_ready.wait(), timeout=1.0)
+    except asyncio.TimeoutError:
+        pass
+    try:
+        mtime = PORT_FILE.stat().st_mtime_ns
+        if mtime != cached_port_mtime:
+            cached_port, cached_port_mtime = int(PORT_FILE.read_text().strip()), mtime
+        return cached_port
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[mcp-entry] Could not read port from {PORT_FILE}: {e}", file=sys.stderr, flush=True)
     # Fall back to default port
     return WS_PORT
 
@@ -202,16 +270,9 @@ def handle_tools_call(msg):
     tool_name = params.get("name")
     arguments = params.get("arguments", {})
     
-    if tool_name == "gdb-tail":
-        handle_gdb_tail(msg, arguments)
-    elif tool_name == "gdb-read-file":
-        handle_gdb_read_file(msg, arguments)
-    elif tool_name == "gdb-file-info":
-        handle_gdb_file_info(msg)
-    elif tool_name == "gdb-clear-file":
-        handle_gdb_clear_file(msg, arguments)
-    elif tool_name == "gdb-explain":
-        handle_gdb_explain(msg, arguments)
+    handler = TOOL_TABLE.get(tool_name)
+    if handler:
+        return handler(msg, arguments)
     else:
         # unknown tool -> error
         resp = {
@@ -224,23 +285,53 @@ def handle_tools_call(msg):
         }
         send(resp)
 
-def handle_gdb_tail(msg, arguments):
+GDB_TAIL_TEXT = "WebSocket server is running on {connect_uri}.\n\nConnect to this URI to stream gdb.txt file updates in real-time. The server will send new lines as they are appended to the file."
+gdb_tail_results = {}  # Serialized gdb-tail result per port, built on first use
+
+async def handle_gdb_tail(msg, arguments):
     """Handle gdb-tail tool call - returns WebSocket URI."""
-    actual_port = get_actual_port()
-    connect_uri = f"ws://127.0.0.1:{actual_port}"
+    actual_port = await get_actual_port()
+    result_bytes = gdb_tail_results.get(actual_port)
+    if result_bytes is None:
+        connect_uri = f"ws://127.0.0.1:{actual_port}"
+        result = {
+            "content": [
+                {
+                    "type": "text",
+                    "text": GDB_TAIL_TEXT.format(connect_uri=connect_uri)
+                }
+            ],
+            "isError": False
+        }
+        result_bytes = gdb_tail_results[actual_port] = json_dumps(result)
     
-    result = {
-        "content": [
-            {
-                "type": "text",
-                "text": f"WebSocket server is running on {connect_uri}.\n\nConnect to this URI to stream gdb.txt file updates in real-time. The server will send new lines as they are appended to the file."
-            }
-        ],
-        "isError": False
-    }
+    send_result(msg.get("id"), result_bytes)
+
+def read_last_lines(path, count):
+    """Return the last `count` lines of a file, reading blocks backwards from its end."""
+    blocks = []
+    newlines = 0
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        while pos > 0 and newlines < count:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            if not blocks and block.endswith(b"\n"):
+                newlines -= 1  # ends the last line, doesn't separate two
+            newlines += block.count(b"\n")
+            blocks.append(block)
+    data = b"".join(reversed(blocks))
     
-    resp = {"jsonrpc": "2.0", "id": msg.get("id"), "result": result}
-    send(resp)
+    # Cut just after the count-th separating newline from the end
+    start = len(data) - 1 if data.endswith(b"\n") else len(data)
+    for _ in range(count):
+        start = data.rfind(b"\n", 0, start)
+        if start == -1:
+            break
+    # Decode the same way open(path, "r", errors="ignore") would
+    return io.TextIOWrapper(io.BytesIO(data[start + 1:]), errors="ignore").readlines()
 
 def handle_gdb_read_file(msg, arguments):
     """Handle gdb-read-file tool call - reads the file content."""
@@ -261,16 +352,15 @@ def handle_gdb_read_file(msg, arguments):
         return
     
     try:
-        with FILE_PATH.open("r", errors="ignore") as f:
-            all_lines = f.readlines()
-            
         if lines_to_read > 0:
             # Read last N lines
-            content_lines = all_lines[-lines_to_read:]
+            content_lines = read_last_lines(FILE_PATH, lines_to_read)
             content = "".join(content_lines)
             info = f"Last {len(content_lines)} lines of {FILE_PATH.name}:"
         else:
             # Read all
+            with FILE_PATH.open("r", errors="ignore") as f:
+                all_lines = f.readlines()
             content = "".join(all_lines)
             info = f"Full content of {FILE_PATH.name} ({len(all_lines)} lines):"
         
@@ -297,7 +387,7 @@ def handle_gdb_read_file(msg, arguments):
     resp = {"jsonrpc": "2.0", "id": msg.get("id"), "result": result}
     send(resp)
 
-def handle_gdb_file_info(msg):
+def handle_gdb_file_info(msg, arguments):
     """Handle gdb-file-info tool call - returns file statistics."""
     if not FILE_PATH.exists():
         result = {
@@ -311,13 +401,20 @@ def handle_gdb_file_info(msg):
         }
     else:
         try:
-            stat = FILE_PATH.stat()
-            size = stat.st_size
-            modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
+            st = FILE_PATH.stat()
+            size = st.st_size
+            modified = datetime.fromtimestamp(st.st_mtime).isoformat()
             
-            # Count lines
-            with FILE_PATH.open("r", errors="ignore") as f:
-                line_count = sum(1 for _ in f)
+            # Count lines on the raw bytes, a large block at a time; a final
+            # line without a trailing newline still counts as a line
+            line_count = 0
+            last_byte = b"\n"
+            with FILE_PATH.open("rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    line_count += block.count(b"\n")
+                    last_byte = block[-1:]
+            if last_byte != b"\n":
+                line_count += 1
             
             info_text = f"""File Information:
 Path: {FILE_PATH}
@@ -403,9 +500,99 @@ def handle_gdb_clear_file(msg, arguments):
     resp = {"jsonrpc": "2.0", "id": msg.get("id"), "result": result}
     send(resp)
 
+# Patterns used by analyze_gdb_output, compiled once at import. They are
+# bytes patterns because the analysis runs on the raw (memory-mapped) file.
+ERROR_PATTERNS = [
+    rb"Error: (.+)",
+    rb"error: (.+)",
+    rb"Segmentation fault",
+    rb"Signal (.+) received",
+    rb"Program received signal",
+    rb"Fatal error",
+    rb"Don't know how to run",
+    rb"The program is not being run",
+    rb"Undefined command",
+    rb"No symbol table is loaded",
+    rb"Unrecognized argument"
+]
+ERROR_RE = re.compile(b"|".join(ERROR_PATTERNS), re.IGNORECASE)
+BP_RE = re.compile(rb"(\d+)\s+breakpoint\s+(\w+)\s+(\w+)\s+([yn])\s+0x([0-9a-fA-F]+)\s+<(.+)>")
+FUNC_RE = re.compile(rb"Dump of assembler code for function (\w+):")
+ASM_RE = re.compile(rb"0x[0-9a-fA-F]+\s+<[^>]+>:")
+FILE_RE = re.compile(rb"Symbols from \"(.+)\"")
+EXEC_RE = re.compile(rb"`(.+)', file type (.+)")
+ENTRY_RE = re.compile(rb"Entry point: (0x[0-9a-fA-F]+)")
+
+# Every line analyze_gdb_output acts on contains one of these (lowercased)
+# fragments, so a single search of the lowered line lets the per-category
+# checks below skip all other lines.
+GDB_LINE_RE = re.compile(b"|".join(re.escape(fragment) for fragment in [
+    b"error: ",
+    b"segmentation fault",
+    b"signal ",
+    b"program received signal",
+    b"fatal error",
+    b"don't know how to run",
+    b"the program is not being run",
+    b"undefined command",
+    b"no symbol table is loaded",
+    b"unrecognized argument",
+    b"warning",
+    b"breakpoint",
+    b"dump of assembler code for function ",
+    b">:",
+    b"symbols from \"",
+    b"', file type ",
+    b"entry point: 0x",
+    b"program exited",
+    b"exited normally",
+    b"reading symbols",
+    b"no debugging symbols found"
+]))
+NON_BLANK_RE = re.compile(rb"\S")
+ANALYZE_CHUNK_SIZE = 1024 * 1024  # Bytes of the file copied out per scan step
+
+# Files larger than this are only summarized from their head and tail unless
+# a detailed explanation is asked for
+EXPLAIN_FULL_SCAN_LIMIT = 1024 * 1024
+EXPLAIN_HEAD_SIZE = 64 * 1024
+EXPLAIN_TAIL_SIZE = 256 * 1024
+
+# Substring checks for execution status and common issues, in priority
+# order: on a line with several keywords the first status wins and issues
+# are reported in list order.
+STATUS_KEYWORDS = [
+    (b"The program is not being run", "not_running"),
+    (b"Program received signal", "crashed"),
+    (b"Program exited", "exited"),
+    (b"exited normally", "exited"),
+    (b"Reading symbols", "loading")
+]
+ISSUE_KEYWORDS = [
+    (b"No debugging symbols found", "No debugging symbols found - compile with -g flag for better debugging"),
+    (b"Don't know how to run", "Program target not configured - use 'run' command or 'target' command"),
+    (b"Undefined command", "Invalid GDB command used"),
+    (b"No symbol table is loaded", "No symbol table loaded - use 'file' command to load executable")
+]
+KEYWORD_RE = re.compile(b"|".join(re.escape(keyword) for keyword, _ in STATUS_KEYWORDS + ISSUE_KEYWORDS))
+
+def _record_keywords(analysis, found):
+    """Update execution status and issues from the keywords found on one line."""
+    for keyword, status in STATUS_KEYWORDS:
+        if keyword in found:
+            analysis["execution_status"] = status
+            break
+    for keyword, issue in ISSUE_KEYWORDS:
+        if keyword in found:
+            analysis["issues"].append(issue)
+
 def analyze_gdb_output(content, detail_level="intermediate", focus="all"):
-    """Analyze GDB output and extract key information."""
-    lines = content.split('\n')
+    """Analyze GDB output and extract key information.
+    
+    `content` is the raw file as bytes, or a list of (chunks, first_line)
+    pairs where chunks is an iterable of line-aligned blocks of bytes, as
+    read by file_chunks.
+    """
     analysis = {
         "errors": [],
         "warnings": [],
@@ -419,108 +606,104 @@ def analyze_gdb_output(content, detail_level="intermediate", focus="all"):
         "recommendations": []
     }
     
-    # Patterns to match
-    error_patterns = [
-        r"Error: (.+)",
-        r"error: (.+)",
-        r"Segmentation fault",
-        r"Signal (.+) received",
-        r"Program received signal",
-        r"Fatal error",
-        r"Don't know how to run",
-        r"The program is not being run",
-        r"Undefined command",
-        r"No symbol table is loaded",
-        r"Unrecognized argument"
-    ]
-    
-    breakpoint_pattern = r"(\d+)\s+breakpoint\s+(\w+)\s+(\w+)\s+([yn])\s+0x([0-9a-fA-F]+)\s+<(.+)>"
-    function_pattern = r"Dump of assembler code for function (\w+):"
-    assembly_pattern = r"0x[0-9a-fA-F]+\s+<[^>]+>:"
-    file_pattern = r"Symbols from \"(.+)\""
-    exec_file_pattern = r"`(.+)', file type (.+)"
-    entry_point_pattern = r"Entry point: (0x[0-9a-fA-F]+)"
-    
     in_assembly = False
     current_function = None
     
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        
-        # Check for errors
-        for pattern in error_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                analysis["errors"].append({
-                    "line": i + 1,
-                    "message": line_stripped,
-                    "type": "error"
-                })
-                break
-        
-        # Check for warnings
-        if "warning" in line.lower() or "Warning" in line:
-            analysis["warnings"].append({
-                "line": i + 1,
-                "message": line_stripped
-            })
-        
-        # Extract breakpoints
-        bp_match = re.search(breakpoint_pattern, line)
-        if bp_match:
-            bp_num, bp_type, disp, enabled, address, location = bp_match.groups()
-            analysis["breakpoints"].append({
-                "number": bp_num,
-                "type": bp_type,
-                "enabled": enabled == "y",
-                "address": address,
-                "location": location
-            })
-        
-        # Extract function information
-        func_match = re.search(function_pattern, line)
-        if func_match:
-            func_name = func_match.group(1)
-            current_function = func_name
-            analysis["functions"].append(func_name)
-            in_assembly = True
-        
-        # Detect assembly code
-        if re.search(assembly_pattern, line):
-            analysis["assembly_code"] = True
-        
-        # Extract file information
-        file_match = re.search(file_pattern, line)
-        if file_match:
-            analysis["file_info"]["symbol_file"] = file_match.group(1)
-        
-        exec_match = re.search(exec_file_pattern, line)
-        if exec_match:
-            analysis["file_info"]["executable"] = exec_match.group(1)
-            analysis["file_info"]["file_type"] = exec_match.group(2)
-        
-        entry_match = re.search(entry_point_pattern, line)
-        if entry_match:
-            analysis["file_info"]["entry_point"] = entry_match.group(1)
-        
-        # Check execution status
-        if "The program is not being run" in line:
-            analysis["execution_status"] = "not_running"
-        elif "Program received signal" in line:
-            analysis["execution_status"] = "crashed"
-        elif "Program exited" in line or "exited normally" in line:
-            analysis["execution_status"] = "exited"
-        elif "Reading symbols" in line:
-            analysis["execution_status"] = "loading"
-        
-        # Detect common issues
-        if "No debugging symbols found" in line:
-            analysis["issues"].append("No debugging symbols found - compile with -g flag for better debugging")
-        if "Don't know how to run" in line:
-            analysis["issues"].append("Program target not configured - use 'run' command or 'target' command")
-        if "Undefined command" in line:
-            analysis["issues"].append("Invalid GDB command used")
-        if "No symbol table is loaded" in line:
-            analysis["issues"].append("No symbol table loaded - use 'file' command to load executable")
+    parts = content if isinstance(content, list) else [(split_chunks(content), 1)]
+    
+    # Walk each part in line-aligned chunks so that only one chunk (and its
+    # lowered copy) is in memory at a time. Within a chunk, only lines
+    # containing a GDB_LINE_RE fragment are cut out and inspected.
+    for chunks, line_no in parts:
+        for chunk in chunks:
+            lowered = chunk.lower()
+            
+            counted = 0
+            pos = 0
+            while True:
+                match = GDB_LINE_RE.search(lowered, pos)
+                if not match:
+                    break
+                start = lowered.rfind(b"\n", 0, match.start()) + 1
+                end = lowered.find(b"\n", match.end())
+                if end == -1:
+                    end = len(lowered)
+                line = chunk[start:end]
+                if line.endswith(b"\r"):
+                    line = line[:-1]
+                pos = end + 1
+                
+                # Check for errors, and for warnings reusing the already lowered chunk
+                is_error = ERROR_RE.search(line)
+                is_warning = lowered.find(b"warning", start, end) != -1
+                
+                # Only errors and warnings record a line number and message, so
+                # newlines are counted and the line decoded just when one matched
+                if is_error or is_warning:
+                    line_no += chunk.count(b"\n", counted, start)
+                    counted = start
+                    line_stripped = line.decode(errors="ignore").strip()
+                
+                if is_error:
+                    analysis["errors"].append({
+                        "line": line_no,
+                        "message": line_stripped,
+                        "type": "error"
+                    })
+                
+                if is_warning:
+                    analysis["warnings"].append({
+                        "line": line_no,
+                        "message": line_stripped
+                    })
+                
+                # Extract breakpoints
+                bp_match = BP_RE.search(line)
+                if bp_match:
+                    bp_num, bp_type, disp, enabled, address, location = (
+                        group.decode(errors="ignore") for group in bp_match.groups()
+                    )
+                    analysis["breakpoints"].append({
+                        "number": bp_num,
+                        "type": bp_type,
+                        "enabled": enabled == "y",
+                        "address": address,
+                        "location": location
+                    })
+                
+                # Extract function information
+                func_match = FUNC_RE.search(line)
+                if func_match:
+                    func_name = func_match.group(1).decode()
+                    current_function = func_name
+                    analysis["functions"].append(func_name)
+                    in_assembly = True
+                
+                # Detect assembly code
+                if ASM_RE.search(line):
+                    analysis["assembly_code"] = True
+                
+                # Extract file information
+                file_match = FILE_RE.search(line)
+                if file_match:
+                    analysis["file_info"]["symbol_file"] = file_match.group(1).decode(errors="ignore")
+                
+                exec_match = EXEC_RE.search(line)
+                if exec_match:
+                    analysis["file_info"]["executable"] = exec_match.group(1).decode(errors="ignore")
+                    analysis["file_info"]["file_type"] = exec_match.group(2).decode(errors="ignore")
+                
+                entry_match = ENTRY_RE.search(line)
+                if entry_match:
+                    analysis["file_info"]["entry_point"] = entry_match.group(1).decode()
+                
+                # Check execution status and detect common issues
+                found = KEYWORD_RE.findall(line)
+                if found:
+                    _record_keywords(analysis, found)
+            
+            # Carry the line count over to the next chunk
+            line_no += chunk.count(b"\n", counted)
     
     # Generate recommendations
     if analysis["execution_status"] == "not_running":
@@ -536,132 +719,179 @@ def analyze_gdb_output(content, detail_level="intermediate", focus="all"):
     
     return analysis
 
+def split_chunks(content):
+    """Yield bytes in line-aligned chunks of about ANALYZE_CHUNK_SIZE bytes."""
+    size = len(content)
+    chunk_start = 0
+    while chunk_start < size:
+        chunk_end = content.find(b"\n", chunk_start + ANALYZE_CHUNK_SIZE)
+        chunk_end = size if chunk_end == -1 else chunk_end + 1
+        yield content[chunk_start:chunk_end]
+        chunk_start = chunk_end
+
+def file_chunks(f):
+    """Yield the rest of file f in line-aligned chunks of about ANALYZE_CHUNK_SIZE
+    bytes, so a large file is never held in memory at once."""
+    pending = bytearray()
+    for block in iter(lambda: f.read(ANALYZE_CHUNK_SIZE), b""):
+        pending += block
+        end = pending.rfind(b"\n") + 1
+        if end:
+            yield bytes(pending[:end])
+            del pending[:end]
+    if pending:
+        yield bytes(pending)
+
+def summary_parts(f, size):
+    """Read the head and tail of a large file on line boundaries for analyze_gdb_output."""
+    f.seek(0)
+    head = f.read(EXPLAIN_HEAD_SIZE)
+    head = head[:head.rfind(b"\n") + 1]
+    # Count the lines before the tail so its line numbers stay accurate
+    tail_start = max(0, size - EXPLAIN_TAIL_SIZE)
+    tail_first_line = 1
+    f.seek(0)
+    remaining = tail_start
+    while remaining > 0:
+        block = f.read(min(ANALYZE_CHUNK_SIZE, remaining))
+        if not block:
+            break
+        tail_first_line += block.count(b"\n")
+        remaining -= len(block)
+    # The tail starts after the first newline at or past tail_start
+    tail = f.read()
+    cut = tail.find(b"\n") + 1
+    tail_first_line += 1 if cut else 0
+    return [([head], 1), ([tail[cut:]] if cut else [], tail_first_line)]
+
+# Simple explanations for common GDB errors, keyed by text in the error line
+ERROR_EXPLANATIONS = {
+    "Don't know how to run": "GDB doesn't know how to execute the program. Try: `run` or `target exec <file>`",
+    "The program is not being run": "The program hasn't been started yet. Use `run` command to begin execution",
+    "No symbol table is loaded": "GDB doesn't have debugging information. Load the executable with `file <path>`",
+    "No debugging symbols found": "The program was compiled without debug info. Recompile with `-g` flag",
+    "Undefined command": "You used a command that GDB doesn't recognize. Check spelling or use `help`",
+    "Unrecognized argument": "A command received an invalid argument. Check the command syntax"
+}
+ERROR_EXPLANATION_RE = re.compile("|".join(re.escape(key) for key in ERROR_EXPLANATIONS))
+
 def format_explanation(analysis, detail_level, focus):
     """Format the analysis into a readable explanation."""
-    explanation_parts = []
+    buf = io.StringIO()
+    w = buf.write
     
     # Header
-    explanation_parts.append("## GDB Output Analysis\n")
-    explanation_parts.append("This analysis breaks down the GDB debugging session to help you understand what's happening.\n")
+    w("## GDB Output Analysis\n")
+    w("This analysis breaks down the GDB debugging session to help you understand what's happening.\n")
     
     # Executive Summary
     if detail_level in ["intermediate", "detailed"]:
-        explanation_parts.append("### 📋 Executive Summary\n")
-        explanation_parts.append(f"- **Execution Status**: {analysis['execution_status'].replace('_', ' ').title()}\n")
-        explanation_parts.append(f"- **Functions Found**: {len(analysis['functions'])}\n")
-        explanation_parts.append(f"- **Breakpoints Set**: {len(analysis['breakpoints'])}\n")
-        explanation_parts.append(f"- **Errors Detected**: {len(analysis['errors'])}\n")
-        explanation_parts.append(f"- **Assembly Code Present**: {'Yes' if analysis['assembly_code'] else 'No'}\n\n")
+        w("### 📋 Executive Summary\n")
+        w(f"- **Execution Status**: {analysis['execution_status'].replace('_', ' ').title()}\n")
+        w(f"- **Functions Found**: {len(analysis['functions'])}\n")
+        w(f"- **Breakpoints Set**: {len(analysis['breakpoints'])}\n")
+        w(f"- **Errors Detected**: {len(analysis['errors'])}\n")
+        w(f"- **Assembly Code Present**: {'Yes' if analysis['assembly_code'] else 'No'}\n\n")
     
     # File Information
     if analysis['file_info'] and focus in ["all", "execution"]:
-        explanation_parts.append("### 📁 File Information\n")
+        w("### 📁 File Information\n")
         if analysis['file_info'].get('executable'):
-            explanation_parts.append(f"- **Executable**: `{analysis['file_info']['executable']}`\n")
+            w(f"- **Executable**: `{analysis['file_info']['executable']}`\n")
         if analysis['file_info'].get('file_type'):
-            explanation_parts.append(f"- **File Type**: {analysis['file_info']['file_type']}\n")
+            w(f"- **File Type**: {analysis['file_info']['file_type']}\n")
         if analysis['file_info'].get('entry_point'):
-            explanation_parts.append(f"- **Entry Point**: {analysis['file_info']['entry_point']}\n")
+            w(f"- **Entry Point**: {analysis['file_info']['entry_point']}\n")
         if analysis['file_info'].get('symbol_file'):
-            explanation_parts.append(f"- **Symbol File**: `{analysis['file_info']['symbol_file']}`\n")
-        explanation_parts.append("\n")
+            w(f"- **Symbol File**: `{analysis['file_info']['symbol_file']}`\n")
+        w("\n")
     
     # Functions
     if analysis['functions'] and focus in ["all", "assembly", "execution"]:
-        explanation_parts.append("### 🔍 Functions Analyzed\n")
+        w("### 🔍 Functions Analyzed\n")
         for func in analysis['functions']:
-            explanation_parts.append(f"- **{func}()**: Assembly code was dumped for this function\n")
-        explanation_parts.append("\n")
+            w(f"- **{func}()**: Assembly code was dumped for this function\n")
+        w("\n")
         if detail_level == "detailed":
-            explanation_parts.append("💡 **What this means**: GDB disassembled these functions to show the machine code instructions.\n\n")
+            w("💡 **What this means**: GDB disassembled these functions to show the machine code instructions.\n\n")
     
     # Breakpoints
     if analysis['breakpoints'] and focus in ["all", "breakpoints", "execution"]:
-        explanation_parts.append("### 🎯 Breakpoints\n")
+        w("### 🎯 Breakpoints\n")
         for bp in analysis['breakpoints']:
             status = "Enabled" if bp['enabled'] else "Disabled"
-            explanation_parts.append(f"- **Breakpoint #{bp['number']}**: {status} at `{bp['location']}` (address: 0x{bp['address']})\n")
-        explanation_parts.append("\n")
+            w(f"- **Breakpoint #{bp['number']}**: {status} at `{bp['location']}` (address: 0x{bp['address']})\n")
+        w("\n")
         if detail_level in ["intermediate", "detailed"]:
-            explanation_parts.append("💡 **What this means**: Breakpoints pause program execution at specific locations. Use 'continue' to run until the next breakpoint.\n\n")
+            w("💡 **What this means**: Breakpoints pause program execution at specific locations. Use 'continue' to run until the next breakpoint.\n\n")
     
     # Errors
     if analysis['errors'] and focus in ["all", "errors"]:
-        explanation_parts.append("### ❌ Errors and Issues\n")
+        w("### ❌ Errors and Issues\n")
         for error in analysis['errors'][:10]:  # Limit to first 10
-            explanation_parts.append(f"- **Line {error['line']}**: {error['message']}\n")
-        explanation_parts.append("\n")
+            w(f"- **Line {error['line']}**: {error['message']}\n")
+        w("\n")
         
         # Explain common errors in simple terms
-        error_explanations = {
-            "Don't know how to run": "GDB doesn't know how to execute the program. Try: `run` or `target exec <file>`",
-            "The program is not being run": "The program hasn't been started yet. Use `run` command to begin execution",
-            "No symbol table is loaded": "GDB doesn't have debugging information. Load the executable with `file <path>`",
-            "No debugging symbols found": "The program was compiled without debug info. Recompile with `-g` flag",
-            "Undefined command": "You used a command that GDB doesn't recognize. Check spelling or use `help`",
-            "Unrecognized argument": "A command received an invalid argument. Check the command syntax"
-        }
-        
         if detail_level in ["intermediate", "detailed"]:
-            explanation_parts.append("**Simple Explanations**:\n")
+            w("**Simple Explanations**:\n")
             for error in analysis['errors'][:5]:
-                for key, explanation in error_explanations.items():
-                    if key in error['message']:
-                        explanation_parts.append(f"- **{key}**: {explanation}\n")
-                        break
-            explanation_parts.append("\n")
+                match = ERROR_EXPLANATION_RE.search(error['message'])
+                if match:
+                    w(f"- **{match.group()}**: {ERROR_EXPLANATIONS[match.group()]}\n")
+            w("\n")
     
     # Issues
     if analysis['issues'] and focus in ["all", "errors"]:
-        explanation_parts.append("### ⚠️ Common Issues Detected\n")
+        w("### ⚠️ Common Issues Detected\n")
         for issue in analysis['issues']:
-            explanation_parts.append(f"- {issue}\n")
-        explanation_parts.append("\n")
+            w(f"- {issue}\n")
+        w("\n")
     
     # Technical Findings
     if detail_level in ["intermediate", "detailed"]:
-        explanation_parts.append("### 🔬 Technical Findings\n")
+        w("### 🔬 Technical Findings\n")
         
         if analysis['assembly_code']:
-            explanation_parts.append("- **Assembly Code Present**: The output contains disassembled machine code\n")
-            explanation_parts.append("  - This shows the low-level instructions the CPU executes\n")
-            explanation_parts.append("  - Useful for understanding program flow and debugging at the machine level\n")
+            w("- **Assembly Code Present**: The output contains disassembled machine code\n")
+            w("  - This shows the low-level instructions the CPU executes\n")
+            w("  - Useful for understanding program flow and debugging at the machine level\n")
         
         if analysis['breakpoints']:
-            explanation_parts.append("- **Breakpoints Configured**: Debugging breakpoints are set up\n")
-            explanation_parts.append("  - Breakpoints allow you to pause execution at specific points\n")
-            explanation_parts.append("  - Use `info breakpoints` to see all breakpoints\n")
+            w("- **Breakpoints Configured**: Debugging breakpoints are set up\n")
+            w("  - Breakpoints allow you to pause execution at specific points\n")
+            w("  - Use `info breakpoints` to see all breakpoints\n")
         
         if analysis['execution_status'] == "not_running":
-            explanation_parts.append("- **Program Not Running**: The program is loaded but not executing\n")
-            explanation_parts.append("  - This is normal when first starting GDB\n")
-            explanation_parts.append("  - Use `run` to start execution\n")
+            w("- **Program Not Running**: The program is loaded but not executing\n")
+            w("  - This is normal when first starting GDB\n")
+            w("  - Use `run` to start execution\n")
         
-        explanation_parts.append("\n")
+        w("\n")
     
     # Recommendations
     if analysis['recommendations']:
-        explanation_parts.append("### 💡 Recommended Next Steps\n")
+        w("### 💡 Recommended Next Steps\n")
         for i, rec in enumerate(analysis['recommendations'], 1):
-            explanation_parts.append(f"{i}. {rec}\n")
-        explanation_parts.append("\n")
+            w(f"{i}. {rec}\n")
+        w("\n")
     
     # Quick Reference
     if detail_level == "detailed":
-        explanation_parts.append("### 📚 Quick GDB Command Reference\n")
-        explanation_parts.append("- `run` or `r` - Start program execution\n")
-        explanation_parts.append("- `break <function>` or `b <function>` - Set breakpoint at function\n")
-        explanation_parts.append("- `break <line>` or `b <line>` - Set breakpoint at line number\n")
-        explanation_parts.append("- `continue` or `c` - Continue execution until next breakpoint\n")
-        explanation_parts.append("- `file <path>` - Load executable file\n")
-        explanation_parts.append("- `list` or `l` - Show source code\n")
-        explanation_parts.append("- `info breakpoints` - List all breakpoints\n")
-        explanation_parts.append("- `info registers` - Show CPU register values\n")
-        explanation_parts.append("- `backtrace` or `bt` - Show function call stack\n")
-        explanation_parts.append("- `print <variable>` or `p <variable>` - Print variable value\n")
-        explanation_parts.append("\n")
+        w("### 📚 Quick GDB Command Reference\n")
+        w("- `run` or `r` - Start program execution\n")
+        w("- `break <function>` or `b <function>` - Set breakpoint at function\n")
+        w("- `break <line>` or `b <line>` - Set breakpoint at line number\n")
+        w("- `continue` or `c` - Continue execution until next breakpoint\n")
+        w("- `file <path>` - Load executable file\n")
+        w("- `list` or `l` - Show source code\n")
+        w("- `info breakpoints` - List all breakpoints\n")
+        w("- `info registers` - Show CPU register values\n")
+        w("- `backtrace` or `bt` - Show function call stack\n")
+        w("- `print <variable>` or `p <variable>` - Print variable value\n")
+        w("\n")
     
-    return "".join(explanation_parts)
+    return buf.getvalue()
 
 def handle_gdb_explain(msg, arguments):
     """Handle gdb-explain tool call - analyzes and explains GDB output."""
@@ -683,11 +913,25 @@ def handle_gdb_explain(msg, arguments):
         return
 
     try:
-        # Read the file
-        with FILE_PATH.open("r", errors="ignore") as f:
-            content = f.read()
+        # Read the file in line-aligned chunks rather than mapping it: gdb may
+        # truncate the file mid-scan, which would fault on a mapping
+        analysis = None
+        truncated = False
+        with FILE_PATH.open("rb") as f:
+            if any(NON_BLANK_RE.search(chunk) for chunk in file_chunks(f)):
+                # Summaries of a large file only need its head
+                # ("Reading symbols", file info) and its tail
+                size = os.fstat(f.fileno()).st_size
+                truncated = size > EXPLAIN_FULL_SCAN_LIMIT and detail_level != "detailed"
+                if truncated:
+                    parts = summary_parts(f, size)
+                else:
+                    f.seek(0)
+                    parts = [(file_chunks(f), 1)]
+                # Analyze the GDB output
+                analysis = analyze_gdb_output(parts, detail_level, focus)
         
-        if not content.strip():
+        if analysis is None:
             result = {
                 "content": [
                     {
@@ -701,9 +945,6 @@ def handle_gdb_explain(msg, arguments):
             send(resp)
             return
         
-        # Analyze the GDB output
-        analysis = analyze_gdb_output(content, detail_level, focus)
-        
         # Generate explanation
         explanation = format_explanation(analysis, detail_level, focus)
         
@@ -720,6 +961,13 @@ The GDB session shows:
 """
             explanation = summary + explanation
         
+        if truncated:
+            explanation = (
+                f"_Note: {FILE_PATH.name} is larger than {EXPLAIN_FULL_SCAN_LIMIT // 1024} KB, so only its first "
+                f"{EXPLAIN_HEAD_SIZE // 1024} KB and last {EXPLAIN_TAIL_SIZE // 1024} KB were analyzed. "
+                f"Use detail_level \"detailed\" to analyze the whole file._\n\n" + explanation
+            )
+        
         result = {
             "content": [
                 {
@@ -744,10 +992,47 @@ The GDB session shows:
     resp = {"jsonrpc": "2.0", "id": msg.get("id"), "result": result}
     send(resp)
 
+# Dispatch tables: JSON-RPC method -> handler(msg), tool name -> handler(msg, arguments).
+# A handler that has to wait (gdb-tail) is a coroutine function; what it
+# returns is awaited by the stdin loop
+METHOD_TABLE = {
+    "initialize": handle_initialize,
+    "tools/list": handle_tools_list,
+    "tools/call": handle_tools_call
+}
+TOOL_TABLE = {
+    "gdb-tail": handle_gdb_tail,
+    "gdb-read-file": handle_gdb_read_file,
+    "gdb-file-info": handle_gdb_file_info,
+    "gdb-clear-file": handle_gdb_clear_file,
+    "gdb-explain": handle_gdb_explain
+}
+
 # Simple stdin loop to read lines and process JSON-RPC
-def stdin_loop():
+async def stdin_loop():
+    global stdout_writer
+    loop = asyncio.get_running_loop()
+    # Pipes are read and written through the event loop; anything else (a
+    # terminal, a file) falls back to blocking reads in a worker thread
+    if is_private_pipe(sys.stdin.fileno()):
+        reader = asyncio.StreamReader(limit=STDIN_LINE_LIMIT)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+        readline = reader.readline
+    else:
+        async def readline():
+            return await loop.run_in_executor(None, sys.stdin.buffer.readline)
+    if is_private_pipe(sys.stdout.fileno()):
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout.buffer)
+        # A zero high-water mark makes drain() wait until each reply is written
+        transport.set_write_buffer_limits(0)
+        stdout_writer = asyncio.StreamWriter(transport, protocol, None, loop)
+
     while True:
-        line = sys.stdin.readline()
+        try:
+            line = await readline()
+        except ValueError as e:
+            print(f"[mcp-entry] skipping oversized stdin line: {e}", file=sys.stderr, flush=True)
+            continue
         if not line:
             # EOF (Claude closed transport)
             print("[mcp-entry] stdin closed (EOF). Exiting.", file=sys.stderr, flush=True)
@@ -756,19 +1041,18 @@ def stdin_loop():
         if not line:
             continue
         try:
-            msg = json.loads(line)
+            msg = json_loads(line)
         except Exception as e:
-            print(f"[mcp-entry] failed to parse JSON from stdin: {e} line={line}", file=sys.stderr, flush=True)
+            print(f"[mcp-entry] failed to parse JSON from stdin: {e} line={line.decode(errors='replace')}", file=sys.stderr, flush=True)
             continue
 
         # Handle requests
         method = msg.get("method")
-        if method == "initialize":
-            handle_initialize(msg)
-        elif method == "tools/list":
-            handle_tools_list(msg)
-        elif method == "tools/call":
-            handle_tools_call(msg)
+        handler = METHOD_TABLE.get(method)
+        if handler:
+            result = handler(msg)
+            if asyncio.iscoroutine(result):
+                await result
         else:
             # If it's a request with id we should reply with method not implemented
             if msg.get("id") is not None:
@@ -777,19 +1061,57 @@ def stdin_loop():
             else:
                 # notification - ignore or log
                 print(f"[mcp-entry] received notification: {method}", file=sys.stderr, flush=True)
+        if stdout_writer is not None:
+            await stdout_writer.drain()
 
-# Run stdin loop. Keep main thread alive while tail subprocess runs.
-try:
-    stdin_loop()
-finally:
-    # Clean up tail subprocess on exit
-    if tail_proc:
-        try:
-            tail_proc.terminate()
-            tail_proc.wait(timeout=2)
-        except Exception:
+async def main():
+    global port_ready
+    port_ready = asyncio.Event()
+    # Start tail server subprocess early; its output is forwarded and its
+    # port file watched by tasks on this loop while stdin is served
+    tail_proc = None
+    tasks = []
+    try:
+        if not TAIL_SCRIPT.exists():
+            print(f"[mcp-entry] ERROR: tail script not found at {TAIL_SCRIPT}", file=sys.stderr, flush=True)
+        else:
+            started_ns = time.time_ns()
+            tail_proc = await start_tail_subprocess()
+            tasks = [
+                asyncio.create_task(forward_stream(tail_proc.stdout, b"[tail-out] ")),
+                asyncio.create_task(forward_stream(tail_proc.stderr, b"[tail-err] ")),
+                asyncio.create_task(watch_port_file(tail_proc, started_ns)),
+            ]
+    except Exception as e:
+        print(f"[mcp-entry] failed to start tail subprocess: {e}", file=sys.stderr, flush=True)
+        tail_proc = None
+    if tail_proc is None:
+        port_ready.set()
+
+    # Run stdin loop. Keep the loop alive while tail subprocess runs.
+    try:
+        await stdin_loop()
+    finally:
+        # Clean up tail subprocess on exit
+        if tail_proc and tail_proc.returncode is None:
             try:
-                tail_proc.kill()
-            except:
-                pass
-    print("[mcp-entry] exiting", file=sys.stderr, flush=True)
+                tail_proc.terminate()
+                await asyncio.wait_for(tail_proc.wait(), timeout=2)
+            except Exception:
+                try:
+                    tail_proc.kill()
+                    await tail_proc.wait()
+                except Exception:
+                    pass
+        # Let the forwarders write the child's last output
+        if tasks:
+            await asyncio.wait(tasks, timeout=1)
+            for task in tasks:
+                task.cancel()
+        print("[mcp-entry] exiting", file=sys.stderr, flush=True)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
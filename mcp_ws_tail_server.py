@@ -6,16 +6,40 @@ Compatible with various websockets versions (handler supports ws or ws,path).
 """
 
 import asyncio
+import errno
+import functools
 import json
 import sys
 from pathlib import Path
 import os
 import socket
+import time
+from typing import List
 from dotenv import load_dotenv
 import websockets
 from websockets.http11 import Response
 from websockets.datastructures import Headers
 
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib json module
+    orjson = None
+
+try:
+    from asyncinotify import Inotify, Mask
+except ImportError:  # optional (Linux only): fall back to polling the file
+    Inotify = Mask = None
+
+try:
+    import uvloop
+except ImportError:  # optional: fall back to the default asyncio event loop
+    uvloop = None
+
+try:
+    import msgspec
+except ImportError:  # optional: only needed for WS_FORMAT=msgpack
+    msgspec = None
+
 # Load .env from script directory
 BASE = Path(__file__).parent
 load_dotenv(BASE / ".env")
@@ -25,29 +49,447 @@ HOST = os.getenv("WS_HOST", "0.0.0.0")
 PORT = int(os.getenv("WS_PORT", "8765"))
 SEND_INTERVAL = float(os.getenv("SEND_INTERVAL", "0"))       # throttle between sends
 READ_CHUNK_DELAY = float(os.getenv("READ_CHUNK_DELAY", "0.2"))
+TAIL_BACKLOG_BYTES = int(os.getenv("TAIL_BACKLOG_BYTES", "0"))  # recent bytes replayed to a new client
+WS_COMPRESSION = os.getenv("WS_COMPRESSION", "deflate").lower()  # "deflate" (permessage-deflate) or "none"
+WS_FORMAT = os.getenv("WS_FORMAT", "json").lower()  # "json" or "msgpack" frame payloads
+BATCH_MAX_LINES = 128  # lines coalesced into one "lines" frame at most
+BATCH_MAX_BYTES = 64 * 1024  # approximate size cap of one "lines" frame
+STAT_CACHE_TTL = 0.25  # seconds a stat of FILE_PATH is reused by health checks
+SUBSCRIBER_QUEUE_SIZE = 256  # frames buffered per client before its oldest frames are dropped
 PORT_FILE = BASE / ".ws_port"  # File to communicate the actual port to entrypoint
 actual_port = PORT  # Global variable to store the actual port being used
+subscribers = {}  # per-client (frame, line count) queue -> lines dropped for it
+tail_position = 0  # file offset up to which the producer has published lines
+tail_error = None  # error frame while the producer cannot read FILE_PATH, else None
+_stat_cache = (float("-inf"), None)  # (monotonic time of the stat, stat result or None)
+
+# JSON encoders producing UTF-8 bytes; _ENCODE is bound once so the per-line
+# loop avoids an attribute lookup
+if orjson is not None:
+    _ENCODE = orjson.dumps
+
+    def encode_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    def _ENCODE(obj):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def encode_pretty(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+if WS_COMPRESSION not in ("deflate", "none"):
+    print(f"[WARN] Unknown WS_COMPRESSION={WS_COMPRESSION!r}; using deflate", file=sys.stderr, flush=True)
+    WS_COMPRESSION = "deflate"
+
+if WS_FORMAT == "msgpack" and msgspec is None:
+    print("[WARN] WS_FORMAT=msgpack requires msgspec; falling back to JSON frames", file=sys.stderr, flush=True)
+    WS_FORMAT = "json"
+
+# Frame builders. Frames are bytes, so they go out as binary frames without
+# the per-frame UTF-8 encoding a text frame needs. JSON frames hold UTF-8 JSON
+# carrying a "type" field; msgpack frames start with a byte tagging the frame
+# type, followed by the msgpack-encoded payload
+FRAME_TAGS = {"meta": 0, "line": 1, "error": 2, "lines": 3, "dropped": 4}
+
+if WS_FORMAT == "msgpack":
+    class Line(msgspec.Struct):
+        data: str
+
+    class Lines(msgspec.Struct):
+        data: List[str]
+
+    _msgpack_encode = msgspec.msgpack.Encoder().encode
+    _TAG_META = bytes([FRAME_TAGS["meta"]])
+    _TAG_LINE = bytes([FRAME_TAGS["line"]])
+    _TAG_ERROR = bytes([FRAME_TAGS["error"]])
+    _TAG_LINES = bytes([FRAME_TAGS["lines"]])
+    _TAG_DROPPED = bytes([FRAME_TAGS["dropped"]])
+
+    # The meta frame declares the tags so clients can dispatch on the first
+    # byte. Only its trailing size value changes, so everything before it is
+    # encoded once (a size of 0 encodes as the single byte 0x00)
+    _META_PREFIX = _TAG_META + _msgpack_encode(
+        {"filename": FILE_PATH.name, "format": "msgpack", "tags": FRAME_TAGS, "size": 0})[:-1]
+
+    def meta_frame(size):
+        return _META_PREFIX + _msgpack_encode(size)
+
+    def line_frame(line):
+        return _TAG_LINE + _msgpack_encode(Line(data=line))
+
+    def lines_frame(lines):
+        return _TAG_LINES + _msgpack_encode(Lines(data=lines))
+
+    def error_frame(msg):
+        return _TAG_ERROR + _msgpack_encode({"msg": msg})
+
+    def dropped_frame(count):
+        return _TAG_DROPPED + _msgpack_encode({"n": count})
+else:
+    # Only the trailing size of the meta frame changes, so the rest is encoded once
+    _META_PREFIX = b'{"type":"meta","filename":' + _ENCODE(FILE_PATH.name) + b',"size":'
+
+    def meta_frame(size):
+        return _META_PREFIX + b"%d}" % size
+
+    # Line frames are assembled around the encoded payload instead of
+    # encoding a fresh dict per frame
+    _LINE_PREFIX = b'{"type":"line","data":'
+    _LINES_PREFIX = b'{"type":"lines","data":'
+    _FRAME_SUFFIX = b"}"
+
+    def line_frame(line):
+        return _LINE_PREFIX + _ENCODE(line) + _FRAME_SUFFIX
+
+    def lines_frame(lines):
+        return _LINES_PREFIX + _ENCODE(lines) + _FRAME_SUFFIX
+
+    def error_frame(msg):
+        return _ENCODE({"type":"error","msg":msg})
+
+    def dropped_frame(count):
+        return b'{"type":"dropped","n":%d}' % count
+
+NOT_FOUND_FRAME = error_frame(f"file not found: {FILE_PATH}")
+
+async def watch_file(path, inode_of):
+    """Yield once per change of path: True after it was moved away or
+    deleted (rotated), False otherwise.
+
+    inode_of() returns the inode of the file the caller has open; path is
+    rotated once it names another inode. Uses inotify when asyncinotify is
+    available, so the caller only wakes on writes; otherwise path is checked
+    every READ_CHUNK_DELAY seconds. The first value is yielded right after
+    the watch is set up, so writes racing the setup are not missed. After a
+    rotation, the caller reopens path before resuming, and the watch moves
+    to the new file.
+    """
+    inotify = None
+    if Inotify is not None:
+        try:
+            inotify = Inotify()
+        except OSError as e:
+            print(f"[WARN] inotify unavailable ({e}); polling {path}", file=sys.stderr, flush=True)
+
+    if inotify is None:
+        while True:
+            try:
+                rotated = os.stat(path).st_ino != inode_of()
+            except FileNotFoundError:
+                rotated = True
+            yield rotated
+            await asyncio.sleep(READ_CHUNK_DELAY)
+
+    # An unlinked file that is still open only reports ATTRIB (its link count
+    # dropped), so ATTRIB counts as a rotation once path names another inode
+    mask = Mask.MODIFY | Mask.ATTRIB | Mask.MOVE_SELF
+    with inotify:
+        watch = None
+        while True:
+            if watch is None:
+                # (re)watch the file the caller just opened; if path is
+                # already gone again or names another file, that is one
+                # more rotation
+                inode = inode_of()
+                try:
+                    watch = inotify.add_watch(path, mask)
+                    rotated = os.stat(path).st_ino != inode
+                except FileNotFoundError:
+                    rotated = True
+                if rotated:
+                    if watch is not None:
+                        try:
+                            inotify.rm_watch(watch)
+                        except OSError:
+                            pass
+                        watch = None
+                    yield True
+                    continue
+                yield False
+            event = await inotify.get()
+            if event.watch is not watch:
+                continue  # late events of a watch dropped after rotation
+            if event.mask & Mask.ATTRIB:
+                try:
+                    rotated = os.stat(path).st_ino != inode
+                except FileNotFoundError:
+                    rotated = True
+            else:
+                rotated = bool(event.mask & Mask.MOVE_SELF)
+            if rotated:
+                try:
+                    inotify.rm_watch(watch)
+                except OSError:
+                    pass
+                watch = None
+            yield rotated
+
+def split_lines(data):
+    # Decode a buffer of complete lines (ending in "\n") with one call and
+    # split it into lines, normalizing CRLF endings. The split itself strips
+    # every terminator; the empty string after the final one is popped rather
+    # than slicing (copying) the decoded text to drop it
+    text = str(data, "utf-8", "ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    lines = text.split("\n")
+    lines.pop()
+    return lines
+
+def line_frames(lines):
+    # Lines are coalesced into "lines" frames of at most BATCH_MAX_LINES lines
+    # (a lone line still goes out as a "line" frame); yields (frame, line count)
+    step, single, batched = BATCH_MAX_LINES, line_frame, lines_frame
+    for i in range(0, len(lines), step):
+        batch = lines[i:i + step]
+        yield (single(batch[0]), 1) if len(batch) == 1 else (batched(batch), len(batch))
+
+def publish_frames(items):
+    # Each (frame, line count) item is queued for every client. A client whose
+    # queue is full loses its oldest frame instead, and the lines lost are
+    # counted so it can be told with a "dropped" frame
+    queue_full = asyncio.QueueFull
+    for item in items:
+        for queue in subscribers:
+            try:
+                queue.put_nowait(item)
+            except queue_full:
+                _, count = queue.get_nowait()
+                subscribers[queue] += count
+                queue.put_nowait(item)
+
+def publish_lines(lines):
+    # Each frame is encoded once, however many clients it goes to
+    publish_frames(line_frames(lines))
+
+def report_tail_error(e):
+    """Log an error reading FILE_PATH and send it to the clients, once per
+    distinct error; clients connecting meanwhile get it from tail_error."""
+    global tail_error
+    frame = error_frame(f"cannot read {FILE_PATH}: {e}")
+    if frame != tail_error:
+        print(f"[WARN] Cannot read {FILE_PATH}: {e!r}; retrying", file=sys.stderr, flush=True)
+        tail_error = frame
+        publish_frames([(frame, 0)])
+
+async def publish_new_lines(raw, buf, filled):
+    """Read everything appended to raw and publish its complete lines.
+
+    Blocks of up to BATCH_MAX_BYTES are read with readinto() straight into
+    buf, a bytearray reused for the life of the file, after the filled bytes
+    of a partial line carried over from the previous read. All complete
+    lines of a block are decoded with one call and split on "\n", and the
+    trailing partial line is moved to the front of buf until its newline
+    arrives; buf only grows for a line longer than itself. The loop yields to
+    the event loop after each block so clients drain their queues while a
+    large append is being read. Returns the new filled count.
+    """
+    global tail_position
+    while True:
+        if len(buf) - filled < BATCH_MAX_BYTES:
+            buf.extend(bytes(BATCH_MAX_BYTES))
+        with memoryview(buf) as view:
+            count = raw.readinto(view[filled:filled + BATCH_MAX_BYTES])
+        if not count:  # EOF
+            return filled
+        filled += count
+        end = buf.rfind(b"\n", 0, filled)
+        if end == -1:
+            continue
+        with memoryview(buf) as view:
+            if subscribers:
+                publish_lines(split_lines(view[:end + 1]))
+            rest = filled - end - 1
+            view[:rest] = view[end + 1:filled]
+        filled = rest
+        tail_position += end + 1
+        await asyncio.sleep(0)
+
+async def open_tail_file():
+    """Open FILE_PATH unbuffered, waiting for it to exist.
+
+    Returns (file, waited), waited telling whether the file was missing at
+    first. A file deleted between checks is simply waited for again.
+    """
+    waited = False
+    while True:
+        try:
+            return FILE_PATH.open("rb", buffering=0), waited
+        except FileNotFoundError:
+            waited = True
+            await asyncio.sleep(READ_CHUNK_DELAY)
+
+async def tail_producer():
+    """Single reader of FILE_PATH shared by all clients: reads appended lines
+    once and fans the frames out to the subscriber queues.
+
+    An error reading the file (a directory, no permission, a stale NFS
+    handle, ...) does not stop the server: it is reported to the clients and
+    the file reopened after READ_CHUNK_DELAY, resuming where reading stopped
+    if it is still the same file.
+    """
+    global tail_position, tail_error
+    buf = bytearray(2 * BATCH_MAX_BYTES)
+    inode = None  # inode of the file last read
+    while True:
+        raw = changes = None
+        try:
+            # open file unbuffered and seek to EOF so we stream only newly
+            # appended lines (a file created, or first readable, after
+            # startup is streamed from its start)
+            raw, appeared = await open_tail_file()
+            st = os.fstat(raw.fileno())
+            if inode is None and not appeared and tail_error is None:
+                tail_position = raw.seek(0, os.SEEK_END)
+            elif st.st_ino == inode and st.st_size >= tail_position:
+                raw.seek(tail_position)
+            else:
+                tail_position = 0
+            inode = st.st_ino
+            filled = 0
+            tail_error = None
+            changes = watch_file(FILE_PATH, lambda: os.fstat(raw.fileno()).st_ino)
+            async for rotated in changes:
+                if os.fstat(raw.fileno()).st_size < tail_position + filled:
+                    # truncated in place (gdb-clear-file): stream it from the start
+                    raw.seek(0)
+                    filled = 0
+                    tail_position = 0
+                filled = await publish_new_lines(raw, buf, filled)
+                if rotated:
+                    # the file was rotated: flush its unterminated last line,
+                    # wait for its replacement and stream it from the start
+                    if filled and subscribers:
+                        publish_lines([buf[:filled].decode("utf-8", "ignore").rstrip("\r")])
+                    filled = 0
+                    tail_position = 0
+                    raw.close()
+                    raw, _ = await open_tail_file()
+                    inode = os.fstat(raw.fileno()).st_ino
+                    filled = await publish_new_lines(raw, buf, filled)
+        except OSError as e:
+            report_tail_error(e)
+        finally:
+            if changes is not None:
+                await changes.aclose()
+            if raw is not None:
+                raw.close()
+        await asyncio.sleep(READ_CHUNK_DELAY)
+
+def read_backlog(end):
+    """Return the complete lines within the last TAIL_BACKLOG_BYTES bytes
+    before offset end of FILE_PATH.
+
+    Read with os.pread from a separate fd, so the producer's offset is not
+    disturbed; a line cut by the start of the window is dropped. A file
+    rotated away meanwhile has no backlog. Blocking: run in an executor.
+    """
+    # one byte before the window is read too, to tell whether the window
+    # starts right at a line start
+    start = max(0, end - TAIL_BACKLOG_BYTES - 1)
+    try:
+        fd = os.open(FILE_PATH, os.O_RDONLY)
+    except FileNotFoundError:
+        return []
+    try:
+        data = os.pread(fd, end - start, start)
+    finally:
+        os.close(fd)
+    first = data.find(b"\n") + 1 if start > 0 else 0
+    last = data.rfind(b"\n") + 1
+    if last <= first:
+        return []
+    with memoryview(data) as view:
+        return split_lines(view[first:last])
+
+def client_socket(ws):
+    """Return the TCP socket of a connection with TCP_NODELAY set, or None."""
+    transport = getattr(ws, "transport", None)
+    sock = transport.get_extra_info("socket") if transport is not None else None
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return None
+    try:
+        # asyncio normally sets this already; frames are latency sensitive
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        return None
+    return sock
+
+def set_cork(sock, enabled):
+    # TCP_CORK (Linux) holds partial segments until uncorked, so frames sent
+    # back to back leave in as few segments as possible
+    if sock is not None and hasattr(socket, "TCP_CORK"):
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1 if enabled else 0)
+        except OSError:
+            pass
 
 async def tail_file_send(ws):
-    if not FILE_PATH.exists():
-        await ws.send(json.dumps({"type":"error","msg":f"file not found: {FILE_PATH}"}))
+    try:
+        size = FILE_PATH.stat().st_size
+    except OSError:
+        await ws.send(NOT_FOUND_FRAME)
         return
 
-    # send meta info
-    await ws.send(json.dumps({"type":"meta","filename": FILE_PATH.name, "size": FILE_PATH.stat().st_size}))
+    # subscribe before sending meta info so no line appended after it is missed;
+    # the backlog ends exactly where the queued lines begin
+    queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+    subscribers[queue] = 0
+    backlog_end = tail_position
+    try:
+        send = ws.send
+        await send(meta_frame(size))
+        if tail_error is not None:
+            await send(tail_error)
 
-    # open file and seek to EOF so we stream only newly appended lines
-    with FILE_PATH.open("r", errors="ignore") as f:
-        f.seek(0, os.SEEK_END)
+        if TAIL_BACKLOG_BYTES and backlog_end:
+            # read off the event loop, so a large backlog does not stall
+            # the producer and the other clients
+            backlog = await asyncio.get_running_loop().run_in_executor(None, read_backlog, backlog_end)
+            for frame, _ in line_frames(backlog):
+                await send(frame)
 
+        # The send loops run per frame, so what they use is bound to locals and
+        # the throttled and unthrottled cases get separate loops. Lines the
+        # producer dropped for this client are reported by a "dropped" frame
+        # ahead of the next frame sent, where the gap is
+        get = queue.get
+        dropped_counts = subscribers
+        send_interval = SEND_INTERVAL
+        if send_interval:
+            sleep = asyncio.sleep
+            while True:
+                frame, _ = await get()
+                dropped = dropped_counts[queue]
+                if dropped:
+                    dropped_counts[queue] = 0
+                    await send(dropped_frame(dropped))
+                await send(frame)
+                await sleep(send_interval)
+
+        # Frames already queued behind the next one are sent as one corked burst
+        sock = client_socket(ws)
+        empty, get_nowait = queue.empty, queue.get_nowait
         while True:
-            line = f.readline()
-            if line:
-                await ws.send(json.dumps({"type":"line", "data": line.rstrip("\n")}))
-                if SEND_INTERVAL:
-                    await asyncio.sleep(SEND_INTERVAL)
-            else:
-                await asyncio.sleep(READ_CHUNK_DELAY)
+            frame, _ = await get()
+            burst = not empty()
+            if burst:
+                set_cork(sock, True)
+            try:
+                while True:
+                    dropped = dropped_counts[queue]
+                    if dropped:
+                        dropped_counts[queue] = 0
+                        await send(dropped_frame(dropped))
+                    await send(frame)
+                    if empty():
+                        break
+                    frame, _ = get_nowait()
+            finally:
+                if burst:
+                    set_cork(sock, False)
+    finally:
+        del subscribers[queue]
 
 # Accept either (ws, path) or (ws,) depending on websockets version
 async def handler(ws, path=None):
@@ -67,29 +509,46 @@ async def handler(ws, path=None):
     except Exception as e:
         print(f"[WS] Error while handling client {remote}: {e!r}")
         try:
-            await ws.send(json.dumps({"type":"error","msg":str(e)}))
+            await ws.send(error_frame(str(e)))
         except:
             pass
     finally:
         print(f"[WS] Client disconnected: {remote}")
 
-def is_port_available(host, port):
-    """Check if a port is available for binding."""
+def cached_stat():
+    """Return the stat result of FILE_PATH, or None if it cannot be stat'ed,
+    reusing the last one for up to STAT_CACHE_TTL seconds so bursts of
+    health checks pay for a single stat."""
+    global _stat_cache
+    now = time.monotonic()
+    checked, st = _stat_cache
+    if now - checked < STAT_CACHE_TTL:
+        return st
     try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            s.bind((host, port))
-            return True
+        st = FILE_PATH.stat()
     except OSError:
-        return False
+        st = None
+    _stat_cache = (now, st)
+    return st
 
-def find_available_port(host, start_port, max_attempts=10):
-    """Find an available port starting from start_port."""
-    for i in range(max_attempts):
-        port = start_port + i
-        if is_port_available(host, port):
-            return port
-    return None
+@functools.lru_cache(maxsize=32)
+def health_body(file_exists, file_size, port):
+    """JSON body of the HTTP health response, encoded once per distinct
+    file state and port."""
+    response_data = {
+        "status": "running",
+        "service": "gdb-tail-websocket-server",
+        "file": {
+            "path": str(FILE_PATH),
+            "exists": file_exists,
+            "size": file_size
+        },
+        "websocket": {
+            "url": f"ws://localhost:{port}",
+            "note": "This is a WebSocket server. Use a WebSocket client to connect."
+        }
+    }
+    return encode_pretty(response_data)
 
 def process_request(connection, request):
     """Handle HTTP requests (non-WebSocket) by returning an HTTP response.
@@ -108,27 +567,11 @@ def process_request(connection, request):
         return None
     
     # This is a plain HTTP request - return HTTP response
-    # Get file info
-    file_exists = FILE_PATH.exists()
-    file_size = FILE_PATH.stat().st_size if file_exists else 0
-    
-    # Create JSON response
-    response_data = {
-        "status": "running",
-        "service": "gdb-tail-websocket-server",
-        "file": {
-            "path": str(FILE_PATH),
-            "exists": file_exists,
-            "size": file_size
-        },
-        "websocket": {
-            "url": f"ws://localhost:{actual_port}",
-            "note": "This is a WebSocket server. Use a WebSocket client to connect."
-        }
-    }
+    # Get file info from a recent stat
+    st = cached_stat()
     
-    response_body = json.dumps(response_data, indent=2)
-    response_bytes = response_body.encode('utf-8')
+    # JSON response body, cached per file state
+    response_bytes = health_body(st is not None, st.st_size if st is not None else 0, actual_port)
     
     # Create Headers object for the response
     response_headers = Headers()
@@ -143,16 +586,47 @@ def process_request(connection, request):
         body=response_bytes
     )
 
+async def serve_on_free_port(**serve_options):
+    """Serve on a port picked by the OS, the same one for every address of HOST.
+
+    With port 0, each socket of a HOST resolving to several addresses (e.g.
+    "localhost" -> ::1 and 127.0.0.1) gets its own port, so the server is
+    restarted on the first socket's port until all of them share it.
+    """
+    for _ in range(5):
+        server = await websockets.serve(handler, HOST, 0, **serve_options)
+        if len({sock.getsockname()[1] for sock in server.sockets}) == 1:
+            return server
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        try:
+            return await websockets.serve(handler, HOST, port, **serve_options)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+    raise OSError(errno.EADDRINUSE, f"no free port available on every address of {HOST}")
+
 async def main():
     global actual_port
-    # Check if the default port is available
-    actual_port = PORT
-    if not is_port_available(HOST, PORT):
-        print(f"[WARN] Port {PORT} is already in use. Trying to find an available port...", file=sys.stderr, flush=True)
-        actual_port = find_available_port(HOST, PORT)
-        if actual_port is None:
-            print(f"[ERROR] Could not find an available port starting from {PORT}. Please free up port {PORT} or set WS_PORT to a different value.", file=sys.stderr, flush=True)
-            sys.exit(1)
+    # Start WebSocket server with HTTP request handler; the process_request
+    # callback will handle HTTP requests. If the configured port is taken, the
+    # kernel picks a free one (port 0), which avoids probing ports up front.
+    # Without compression small frames skip per-message deflate work; with it,
+    # repetitive log lines shrink through the per-connection context
+    serve_options = {
+        "process_request": process_request,
+        "compression": None if WS_COMPRESSION == "none" else "deflate",
+    }
+    try:
+        server = await websockets.serve(handler, HOST, PORT, **serve_options)
+    except OSError as e:
+        if e.errno != errno.EADDRINUSE:
+            raise
+        print(f"[WARN] Port {PORT} is already in use. Letting the OS pick an available port...", file=sys.stderr, flush=True)
+        server = await serve_on_free_port(**serve_options)
+    actual_port = server.sockets[0].getsockname()[1]
+    if actual_port != PORT:
         print(f"[INFO] Using port {actual_port} instead of {PORT}", file=sys.stderr, flush=True)
     
     # Write the actual port to a file so the entrypoint can read it
@@ -164,11 +638,10 @@ async def main():
     print(f"[START] Tailing {FILE_PATH} -> ws://{HOST}:{actual_port} (throttling={SEND_INTERVAL}s)")
     print(f"[INFO] HTTP health check available at http://localhost:{actual_port}/", file=sys.stderr, flush=True)
     
-    # Start WebSocket server with HTTP request handler
-    # The process_request callback will handle HTTP requests
+    # The shared tail producer feeds every client for the lifetime of the server
     try:
-        async with websockets.serve(handler, HOST, actual_port, process_request=process_request):
-            await asyncio.Future()  # run forever
+        async with server:
+            await tail_producer()  # run forever
     finally:
         # Clean up port file on exit
         try:
@@ -179,7 +652,10 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("[INFO] Shutting down.", file=sys.stderr, flush=True)
     except OSError as e: